@@ -14,6 +14,7 @@ from visualizations import (
     display_summary_table, create_bar_chart
 )
 from transformer import abc_analysis, xyz_analysis, merge_abc_xyz
+from exporter import handle_data_export
 
 # Initialize the app
 initialize_page()
@@ -107,6 +108,7 @@ if analyze_button or ("transformed_data" in st.session_state and st.session_stat
             
             # Store transformed data in session state
             st.session_state["transformed_data"] = transformed_df
+            st.session_state["export_files"] = None
         else:
             # Use already transformed data
             transformed_df = st.session_state["transformed_data"]
@@ -117,6 +119,11 @@ if analyze_button or ("transformed_data" in st.session_state and st.session_stat
     with st.expander("Preview Transformed Data"):
         st.dataframe(transformed_df.head(5))
     
+    # ===================================
+    # ✅ Export All Territories
+    # ===================================
+    handle_data_export(transformed_df)
+    
     # ===================================
     # ✅ Territory Selection
     # ===================================
@@ -13,6 +13,7 @@ def handle_data_upload():
             # Also clear transformed data if exists
             if "transformed_data" in st.session_state:
                 st.session_state["transformed_data"] = None
+            st.session_state["export_files"] = None
             st.rerun()
         
         # Show upload info
@@ -57,6 +58,7 @@ def handle_data_upload():
             # Clear any previously transformed data
             if "transformed_data" in st.session_state:
                 st.session_state["transformed_data"] = None
+            st.session_state["export_files"] = None
                 
             st.rerun()
             
@@ -77,6 +79,8 @@ def initialize_data_state():
         st.session_state["upload_time"] = None
     if "transformed_data" not in st.session_state:
         st.session_state["transformed_data"] = None
+    if "export_files" not in st.session_state:
+        st.session_state["export_files"] = None
 
 @st.cache_data
 def create_pivot_table(df_territory):
@@ -95,6 +99,27 @@ def create_pivot_table(df_territory):
     
     return pivot_df.reset_index()
 
+@st.cache_data
+def create_all_pivot_tables(df):
+    """Create ABC-XYZ pivot tables for every territory in a single crosstab"""
+    pivot_df = pd.crosstab(
+        index=[df["TERRITORY"], df["ABC(REV-MAR)"]],
+        columns=df["TERRITORY_XYZ"],
+        values=df["INVENTORY"],
+        aggfunc="count"
+    ).fillna(0).astype(int)
+    
+    # Add Row Totals and a Total row per territory
+    pivot_df["Total"] = pivot_df.sum(axis=1)
+    territory_totals = pivot_df.groupby(level="TERRITORY").sum()
+    territory_totals.index = pd.MultiIndex.from_product(
+        [territory_totals.index, ["Total"]], names=pivot_df.index.names
+    )
+    pivot_df = pd.concat([pivot_df, territory_totals]).sort_index(level="TERRITORY", sort_remaining=False)
+    pivot_df.columns.name = None
+    
+    return pivot_df.reset_index()
+
 @st.cache_data
 def apply_filters(df, abc_value, xyz_value):
     """Apply user-selected filters to data"""
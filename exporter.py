@@ -0,0 +1,146 @@
+import tempfile
+from datetime import datetime
+
+import streamlit as st
+import pyarrow as pa
+import pyarrow.parquet as pq
+import xlsxwriter
+
+from data_handler import create_all_pivot_tables
+
+# Number of rows converted and written per chunk
+CHUNK_ROWS = 50_000
+
+# Rows per worksheet allowed by Excel, header row included
+XLSX_MAX_ROWS = 1_048_576
+
+EXPORT_FORMATS = {
+    "Parquet": ("parquet", "application/octet-stream"),
+    "CSV": ("csv", "text/csv"),
+    "Excel (xlsx)": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+
+def iter_chunks(df, chunk_rows=CHUNK_ROWS):
+    """Yield consecutive row slices of a DataFrame"""
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+def write_csv(df, file_obj):
+    """Write a DataFrame to a binary file object as CSV, one chunk at a time"""
+    for i, chunk in enumerate(iter_chunks(df)):
+        file_obj.write(chunk.to_csv(index=False, header=(i == 0)).encode("utf-8"))
+
+def write_parquet(df, file_obj):
+    """Write a DataFrame to a binary file object as parquet, one row group per chunk"""
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(file_obj, schema) as writer:
+        for chunk in iter_chunks(df):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+def write_xlsx(sheets, file_obj):
+    """
+    Write DataFrames to a binary file object as an xlsx workbook
+
+    Parameters:
+    sheets (dict): Sheet name mapped to the DataFrame written on that sheet
+    file_obj (file-like): Binary file object receiving the workbook
+    """
+    # write_row does not raise past the row limit, so check before writing anything
+    for sheet_name, df in sheets.items():
+        if len(df) + 1 > XLSX_MAX_ROWS:
+            raise ValueError(
+                f"'{sheet_name}' has {len(df):,} rows, more than the {XLSX_MAX_ROWS - 1:,} rows "
+                "an Excel sheet can hold. Please export as Parquet or CSV instead."
+            )
+
+    # constant_memory flushes each row to disk as soon as the next one starts
+    workbook = xlsxwriter.Workbook(file_obj, {"constant_memory": True})
+    for sheet_name, df in sheets.items():
+        worksheet = workbook.add_worksheet(sheet_name)
+        worksheet.write_row(0, 0, [str(col) for col in df.columns])
+        row = 1
+        for chunk in iter_chunks(df):
+            # Blank cells instead of NaN, which xlsx cannot store as a number
+            chunk = chunk.astype(object).where(chunk.notna(), None)
+            for values in chunk.itertuples(index=False, name=None):
+                worksheet.write_row(row, 0, values)
+                row += 1
+    workbook.close()
+
+def export_to_tempfile(writer, data):
+    """Run a writer into a temporary file on disk so the export is not built in memory"""
+    file_obj = tempfile.TemporaryFile()
+    writer(data, file_obj)
+    file_obj.flush()
+    return file_obj
+
+def create_export_files(transformed_df, export_format):
+    """
+    Build export files for the full ABC-XYZ results of all territories
+
+    Parameters:
+    transformed_df (pandas.DataFrame): Combined ABC-XYZ analysis
+    export_format (str): Key of EXPORT_FORMATS
+
+    Returns:
+    list: (label, file object, file name, mime type) for each download
+    """
+    extension, mime = EXPORT_FORMATS[export_format]
+    pivot_df = create_all_pivot_tables(transformed_df)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    if extension == "xlsx":
+        sheets = {"ABC-XYZ Results": transformed_df, "ABC-XYZ Matrices": pivot_df}
+        file_obj = export_to_tempfile(write_xlsx, sheets)
+        return [("Workbook", file_obj, f"abc_xyz_export_{timestamp}.xlsx", mime)]
+
+    writer = write_parquet if extension == "parquet" else write_csv
+    return [
+        ("Results", export_to_tempfile(writer, transformed_df),
+         f"abc_xyz_results_{timestamp}.{extension}", mime),
+        ("Matrices", export_to_tempfile(writer, pivot_df),
+         f"abc_xyz_matrices_{timestamp}.{extension}", mime),
+    ]
+
+def discard_export_file(file_name):
+    """Drop a prepared export file once it has been downloaded"""
+    export_files = st.session_state.get("export_files")
+    if not export_files:
+        return
+
+    export_files["files"] = [f for f in export_files["files"] if f[2] != file_name]
+    if not export_files["files"]:
+        st.session_state["export_files"] = None
+
+@st.fragment
+def handle_data_export(transformed_df):
+    """Handle export of ABC-XYZ results for all territories"""
+    st.subheader("💾 Export All Territories")
+
+    export_format = st.radio("Export format:", options=list(EXPORT_FORMATS), horizontal=True)
+
+    if st.button("📦 Prepare Export"):
+        with st.spinner("Writing export files..."):
+            try:
+                st.session_state["export_files"] = {
+                    "format": export_format,
+                    "files": create_export_files(transformed_df, export_format),
+                }
+            except Exception as e:
+                st.session_state["export_files"] = None
+                st.error(f"⚠️ Error creating export: {e}")
+
+    # Only offer files prepared for the currently selected format
+    export_files = st.session_state.get("export_files")
+    if not export_files or export_files["format"] != export_format:
+        return
+
+    cols = st.columns(len(export_files["files"]))
+    for col, (label, file_obj, file_name, mime) in zip(cols, export_files["files"]):
+        with col:
+            # download_button reads the whole file into Streamlit's in-memory media
+            # storage on every run, so each file is dropped again after its download
+            st.download_button(
+                f"⬇️ Download {label}", data=file_obj.raw, file_name=file_name, mime=mime,
+                on_click=discard_export_file, args=(file_name,)
+            )